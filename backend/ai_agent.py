@@ -8,11 +8,12 @@ to provide information about stokvels, users, payments, and enrollments.
 import os
 from typing import List, Dict, Any, Optional
 from datetime import datetime, date
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic_ai import Agent, RunContext
 from pydantic import BaseModel
 
-from config import get_db, OPENAI_API_KEY
+from config import OPENAI_API_KEY
 from models import Stokvel, User, Payments, StokvelEnrollment
 
 
@@ -20,7 +21,7 @@ class StokvelChatbotDependencies(BaseModel):
     """Dependencies for the Stokvel chatbot agent"""
     model_config = {"arbitrary_types_allowed": True}
     
-    db: Session
+    db: AsyncSession
 
 
 # Define the agent with system prompt
@@ -54,7 +55,7 @@ stokvel_agent = Agent(
 async def get_all_stokvels(ctx: RunContext[StokvelChatbotDependencies]) -> List[Dict[str, Any]]:
     """Get information about all stokvels in the database"""
     db = ctx.deps.db
-    stokvels = db.query(Stokvel).all()
+    stokvels = (await db.scalars(select(Stokvel))).all()
     
     result = []
     for stokvel in stokvels:
@@ -77,16 +78,20 @@ async def get_all_stokvels(ctx: RunContext[StokvelChatbotDependencies]) -> List[
 async def get_stokvel_by_id(ctx: RunContext[StokvelChatbotDependencies], stokvel_id: int) -> Optional[Dict[str, Any]]:
     """Get detailed information about a specific stokvel by ID"""
     db = ctx.deps.db
-    stokvel = db.query(Stokvel).filter(Stokvel.id == stokvel_id).first()
+    stokvel = await db.get(Stokvel, stokvel_id)
     
     if not stokvel:
         return None
     
     # Get enrollment count
-    enrollment_count = db.query(StokvelEnrollment).filter(StokvelEnrollment.stokvel_id == stokvel_id).count()
+    enrollment_count = await db.scalar(
+        select(func.count()).select_from(StokvelEnrollment).filter(StokvelEnrollment.stokvel_id == stokvel_id)
+    )
     
     # Get total payments
-    total_payments = db.query(Payments).filter(Payments.stokvel_id == stokvel_id).count()
+    total_payments = await db.scalar(
+        select(func.count()).select_from(Payments).filter(Payments.stokvel_id == stokvel_id)
+    )
     
     return {
         "id": stokvel.id,
@@ -108,11 +113,13 @@ async def get_stokvel_members(ctx: RunContext[StokvelChatbotDependencies], stokv
     """Get all members enrolled in a specific stokvel"""
     db = ctx.deps.db
     
-    enrollments = db.query(StokvelEnrollment).filter(StokvelEnrollment.stokvel_id == stokvel_id).all()
+    enrollments = (await db.scalars(
+        select(StokvelEnrollment).filter(StokvelEnrollment.stokvel_id == stokvel_id)
+    )).all()
     
     result = []
     for enrollment in enrollments:
-        user = db.query(User).filter(User.id == enrollment.userid).first()
+        user = await db.get(User, enrollment.userid)
         if user:
             result.append({
                 "user_id": user.id,
@@ -130,11 +137,13 @@ async def get_user_stokvels(ctx: RunContext[StokvelChatbotDependencies], user_id
     """Get all stokvels a user is enrolled in"""
     db = ctx.deps.db
     
-    enrollments = db.query(StokvelEnrollment).filter(StokvelEnrollment.userid == user_id).all()
+    enrollments = (await db.scalars(
+        select(StokvelEnrollment).filter(StokvelEnrollment.userid == user_id)
+    )).all()
     
     result = []
     for enrollment in enrollments:
-        stokvel = db.query(Stokvel).filter(Stokvel.id == enrollment.stokvel_id).first()
+        stokvel = await db.get(Stokvel, enrollment.stokvel_id)
         if stokvel:
             result.append({
                 "stokvel_id": stokvel.id,
@@ -153,7 +162,7 @@ async def get_payment_history(ctx: RunContext[StokvelChatbotDependencies], user_
     """Get payment history for a user or stokvel"""
     db = ctx.deps.db
     
-    query = db.query(Payments)
+    query = select(Payments)
     
     if user_id:
         query = query.filter(Payments.userid == user_id)
@@ -161,17 +170,17 @@ async def get_payment_history(ctx: RunContext[StokvelChatbotDependencies], user_
     if stokvel_id:
         query = query.filter(Payments.stokvel_id == stokvel_id)
     
-    payments = query.order_by(Payments.date.desc()).limit(50).all()
+    payments = (await db.scalars(query.order_by(Payments.payment_date.desc()).limit(50))).all()
     
     result = []
     for payment in payments:
-        user = db.query(User).filter(User.id == payment.userid).first()
-        stokvel = db.query(Stokvel).filter(Stokvel.id == payment.stokvel_id).first()
+        user = await db.get(User, payment.userid)
+        stokvel = await db.get(Stokvel, payment.stokvel_id)
         
         result.append({
             "payment_id": payment.id,
             "amount": payment.amount,
-            "date": payment.date.isoformat() if payment.date else None,
+            "date": payment.payment_date.isoformat() if payment.payment_date else None,
             "user_name": f"{user.name} {user.surname}" if user else "Unknown User",
             "stokvel_name": stokvel.name if stokvel else "Unknown Stokvel"
         })
@@ -184,21 +193,25 @@ async def get_stokvel_statistics(ctx: RunContext[StokvelChatbotDependencies], st
     """Get comprehensive statistics for a stokvel"""
     db = ctx.deps.db
     
-    stokvel = db.query(Stokvel).filter(Stokvel.id == stokvel_id).first()
+    stokvel = await db.get(Stokvel, stokvel_id)
     if not stokvel:
         return None
     
     # Count members
-    member_count = db.query(StokvelEnrollment).filter(StokvelEnrollment.stokvel_id == stokvel_id).count()
+    member_count = await db.scalar(
+        select(func.count()).select_from(StokvelEnrollment).filter(StokvelEnrollment.stokvel_id == stokvel_id)
+    )
     
     # Count admins
-    admin_count = db.query(StokvelEnrollment).filter(
-        StokvelEnrollment.stokvel_id == stokvel_id,
-        StokvelEnrollment.isAdmin == True
-    ).count()
+    admin_count = await db.scalar(
+        select(func.count()).select_from(StokvelEnrollment).filter(
+            StokvelEnrollment.stokvel_id == stokvel_id,
+            StokvelEnrollment.isAdmin == True
+        )
+    )
     
     # Get payment statistics
-    payments = db.query(Payments).filter(Payments.stokvel_id == stokvel_id).all()
+    payments = (await db.scalars(select(Payments).filter(Payments.stokvel_id == stokvel_id))).all()
     total_collected = sum(p.amount for p in payments) if payments else 0
     payment_count = len(payments)
     
@@ -225,25 +238,28 @@ async def calculate_emergency_withdrawal(ctx: RunContext[StokvelChatbotDependenc
     db = ctx.deps.db
     
     # Get user
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         return {"error": "User not found"}
     
     # Check enrollment
-    enrollment = db.query(StokvelEnrollment).filter(
-        StokvelEnrollment.userid == user_id,
-        StokvelEnrollment.stokvel_id == stokvel_id
-    ).first()
+    enrollment = await db.scalar(
+        select(StokvelEnrollment).filter(
+            StokvelEnrollment.userid == user_id,
+            StokvelEnrollment.stokvel_id == stokvel_id
+        ).limit(1)
+    )
     
     if not enrollment:
         return {"error": "User is not enrolled in this stokvel"}
     
     # Calculate total contributions
-    from sqlalchemy import func
-    total_contributions = db.query(func.sum(Payments.amount)).filter(
-        Payments.userid == user_id,
-        Payments.stokvel_id == stokvel_id
-    ).scalar() or 0
+    total_contributions = await db.scalar(
+        select(func.sum(Payments.amount)).filter(
+            Payments.userid == user_id,
+            Payments.stokvel_id == stokvel_id
+        )
+    ) or 0
     
     if total_contributions <= 0:
         return {"error": "No contributions found"}
@@ -268,13 +284,15 @@ async def search_stokvels_by_name(ctx: RunContext[StokvelChatbotDependencies], s
     """Search for stokvels by name"""
     db = ctx.deps.db
     
-    stokvels = db.query(Stokvel).filter(
-        Stokvel.name.ilike(f"%{search_term}%")
-    ).all()
+    stokvels = (await db.scalars(
+        select(Stokvel).filter(Stokvel.name.ilike(f"%{search_term}%"))
+    )).all()
     
     result = []
     for stokvel in stokvels:
-        member_count = db.query(StokvelEnrollment).filter(StokvelEnrollment.stokvel_id == stokvel.id).count()
+        member_count = await db.scalar(
+            select(func.count()).select_from(StokvelEnrollment).filter(StokvelEnrollment.stokvel_id == stokvel.id)
+        )
         
         result.append({
             "id": stokvel.id,
@@ -288,7 +306,7 @@ async def search_stokvels_by_name(ctx: RunContext[StokvelChatbotDependencies], s
     return result
 
 
-async def chat_with_stokvel_agent(message: str, db: Session) -> str:
+async def chat_with_stokvel_agent(message: str, db: AsyncSession) -> str:
     """
     Main function to chat with the Stokvel AI agent
     
@@ -312,7 +330,7 @@ async def chat_with_stokvel_agent(message: str, db: Session) -> str:
 
 
 # Example usage function for testing
-async def example_conversation(db: Session):
+async def example_conversation(db: AsyncSession):
     """Example conversation with the agent"""
     
     questions = [
@@ -0,0 +1,7 @@
+"""
+Performance benchmarks for the Stokvel backend
+
+Run from the ``backend`` directory, e.g. ``python -m benchmarks.bench_indexes``.
+Benchmarks that need Postgres read its URL from BENCH_DATABASE_URL and will
+create and fill tables in that database, so point it at a scratch database.
+"""
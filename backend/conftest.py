@@ -0,0 +1,52 @@
+"""
+Shared pytest fixtures for the Stokvel backend
+
+Tests run against a throwaway SQLite database through the same async engine
+the API uses, so no Postgres server or OpenAI key is needed.
+"""
+
+import os
+import tempfile
+
+_test_dir = tempfile.mkdtemp(prefix="stokvel-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_test_dir}/stokvel.db")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+import httpx
+import pytest
+
+from config import async_engine, AsyncSessionLocal
+from models import Base
+
+# Manual scripts that need a running server or a real OpenAI key
+collect_ignore = ["test_ai_agent.py", "test_emergency_withdrawal.py"]
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def db_schema():
+    """Create a fresh schema for each test"""
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    await async_engine.dispose()
+
+
+@pytest.fixture
+async def db(db_schema):
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+async def client(db_schema):
+    from main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http_client:
+        yield http_client
@@ -1,7 +1,10 @@
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from contextlib import asynccontextmanager
+from typing import Optional
+import asyncio
 import uvicorn
 
 from models import (
@@ -14,18 +17,25 @@ from models import (
     EmergencyWithdrawalRequestCreate, EmergencyWithdrawalRequestResponse,
     EmergencyWithdrawalApprovalCreate, EmergencyWithdrawalApprovalResponse
 )
-from config import get_db, engine
+from config import get_async_db, get_async_read_db
+from pagination import Page, page_size, paginate
 from ai_agent import chat_with_stokvel_agent
 from pydantic import BaseModel
-import models
+import migrate
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Bring the database schema up to date before serving requests
+    await asyncio.to_thread(migrate.upgrade)
+    yield
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="Stokvel API",
     description="A comprehensive API for managing Stokvel groups",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -44,223 +54,185 @@ async def health_check():
 
 # Stokvel endpoints
 @app.post("/stokvels/", response_model=StokvelResponse)
-async def create_stokvel(stokvel: StokvelCreate, db: Session = Depends(get_db)):
+async def create_stokvel(stokvel: StokvelCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new stokvel group"""
     db_stokvel = Stokvel(**stokvel.model_dump())
     db.add(db_stokvel)
-    db.commit()
-    db.refresh(db_stokvel)
+    await db.commit()
+    await db.refresh(db_stokvel)
     return db_stokvel
 
-@app.get("/stokvels/", response_model=List[StokvelResponse])
-async def get_stokvels(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@app.get("/stokvels/", response_model=Page[StokvelResponse])
+async def get_stokvels(
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get all stokvel groups"""
-    stokvels = db.query(Stokvel).offset(skip).limit(limit).all()
-    return stokvels
+    return await paginate(db, select(Stokvel), [Stokvel.id], cursor, limit)
 
 @app.get("/stokvels/{stokvel_id}", response_model=StokvelResponse)
-async def get_stokvel(stokvel_id: int, db: Session = Depends(get_db)):
+async def get_stokvel(stokvel_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific stokvel group"""
-    stokvel = db.query(Stokvel).filter(Stokvel.id == stokvel_id).first()
+    stokvel = await db.get(Stokvel, stokvel_id)
     if not stokvel:
         raise HTTPException(status_code=404, detail="Stokvel not found")
     return stokvel
 
 # User endpoints
 @app.post("/users/", response_model=UserResponse)
-async def create_user(user: UserCreate, db: Session = Depends(get_db)):
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new user"""
     db_user = User(**user.model_dump())
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
-@app.get("/users/", response_model=List[UserResponse])
-async def get_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+@app.get("/users/", response_model=Page[UserResponse])
+async def get_users(
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size),
+    db: AsyncSession = Depends(get_async_db)
+):
     """Get all users"""
-    users = db.query(User).offset(skip).limit(limit).all()
-    return users
+    return await paginate(db, select(User), [User.id], cursor, limit)
 
 @app.get("/users/{user_id}", response_model=UserResponse)
-async def get_user(user_id: int, db: Session = Depends(get_db)):
+async def get_user(user_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a specific user"""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
 # Stokvel Enrollment endpoints
 @app.post("/enrollments/", response_model=StokvelEnrollmentResponse)
-async def create_enrollment(enrollment: StokvelEnrollmentCreate, db: Session = Depends(get_db)):
+async def create_enrollment(enrollment: StokvelEnrollmentCreate, db: AsyncSession = Depends(get_async_db)):
     """Enroll a user in a stokvel"""
     # Check if user exists
-    user = db.query(User).filter(User.id == enrollment.userid).first()
+    user = await db.get(User, enrollment.userid)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     # Check if stokvel exists
-    stokvel = db.query(Stokvel).filter(Stokvel.id == enrollment.stokvel_id).first()
+    stokvel = await db.get(Stokvel, enrollment.stokvel_id)
     if not stokvel:
         raise HTTPException(status_code=404, detail="Stokvel not found")
     
     # Create enrollment
     db_enrollment = StokvelEnrollment(**enrollment.model_dump())
     db.add(db_enrollment)
-    db.commit()
-    db.refresh(db_enrollment)
+    await db.commit()
+    await db.refresh(db_enrollment)
     return db_enrollment
 
+@app.get("/stokvels/{stokvel_id}/enrollments/", response_model=Page[StokvelEnrollmentResponse])
+async def get_stokvel_enrollments(
+    stokvel_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get all enrollments for a stokvel"""
+    query = select(StokvelEnrollment).filter(StokvelEnrollment.stokvel_id == stokvel_id)
+    return await paginate(db, query, [StokvelEnrollment.id], cursor, limit)
+
 # Payment endpoints
+# Payment lists page newest first on (payment_date, id), matching the payment indexes
+PAYMENT_PAGE_KEY = [Payments.payment_date, Payments.id]
+
 @app.post("/payments/", response_model=PaymentsResponse)
-async def create_payment(payment: PaymentsCreate, db: Session = Depends(get_db)):
+async def create_payment(payment: PaymentsCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new payment and compute its status"""
     # Check if user exists
-    user = db.query(User).filter(User.id == payment.userid).first()
+    user = await db.get(User, payment.userid)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     # Check if stokvel exists
-    stokvel = db.query(Stokvel).filter(Stokvel.id == payment.stokvel_id).first()
+    stokvel = await db.get(Stokvel, payment.stokvel_id)
     if not stokvel:
         raise HTTPException(status_code=404, detail="Stokvel not found")
     
-    # Create payment
+    # Create payment (the refresh loads the status computed by the database)
     db_payment = Payments(**payment.model_dump())
     db.add(db_payment)
-    db.commit()
-    db.refresh(db_payment)
-    
-    # Update payment status based on computation
-    db_payment.payment_status = db_payment.compute_payment_status
-    db.commit()
+    await db.commit()
+    await db.refresh(db_payment)
     
     return db_payment
 
-@app.get("/payments/", response_model=List[PaymentsResponse])
+@app.get("/payments/", response_model=Page[PaymentsResponse])
 async def get_payments(
-    skip: int = 0, 
-    limit: int = 100, 
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size),
     user_id: int = None, 
     stokvel_id: int = None, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """Get all payments with optional filtering by user or stokvel"""
-    query = db.query(Payments)
+    """Get all payments, newest first, with optional filtering by user or stokvel"""
+    query = select(Payments)
     
     if user_id:
         query = query.filter(Payments.userid == user_id)
     if stokvel_id:
         query = query.filter(Payments.stokvel_id == stokvel_id)
     
-    payments = query.offset(skip).limit(limit).all()
-    
-    # Update payment status for all returned payments
-    for payment in payments:
-        payment.payment_status = payment.compute_payment_status
-    db.commit()
-    
-    return payments
+    return await paginate(db, query, PAYMENT_PAGE_KEY, cursor, limit, descending=True)
 
 @app.get("/payments/{payment_id}", response_model=PaymentsResponse)
-async def get_payment(payment_id: int, db: Session = Depends(get_db)):
+async def get_payment(payment_id: int, db: AsyncSession = Depends(get_async_read_db)):
     """Get a specific payment"""
-    payment = db.query(Payments).filter(Payments.id == payment_id).first()
+    payment = await db.get(Payments, payment_id)
     if not payment:
         raise HTTPException(status_code=404, detail="Payment not found")
-    
-    # Update payment status
-    payment.payment_status = payment.compute_payment_status
-    db.commit()
-    
     return payment
-@app.get("/payments/", response_model=List[PaymentsResponse])
-async def get_payments(
-    skip: int = 0, 
-    limit: int = 100, 
-    user_id: int = None, 
-    stokvel_id: int = None, 
-    db: Session = Depends(get_db)
-):
-    """Get all payments with optional filtering by user or stokvel"""
-    query = db.query(Payments)
-    
-    if user_id:
-        query = query.filter(Payments.userid == user_id)
-    if stokvel_id:
-        query = query.filter(Payments.stokvel_id == stokvel_id)
-    
-    payments = query.offset(skip).limit(limit).all()
-    
-    # Update payment status for all returned payments
-    for payment in payments:
-        payment.payment_status = payment.compute_payment_status
-    db.commit()
-    
-    return payments
+
 @app.get("/payments/user/{user_id}/status")
-async def get_user_payment_status(user_id: int, stokvel_id: int, db: Session = Depends(get_db)):
+async def get_user_payment_status(user_id: int, stokvel_id: int, db: AsyncSession = Depends(get_async_read_db)):
     """Check if a user has made their payment for the current month"""
     # Get the most recent payment for the user in the specified stokvel
-    payment = db.query(Payments)\
-        .filter(Payments.userid == user_id)\
-        .filter(Payments.stokvel_id == stokvel_id)\
-        .order_by(Payments.date.desc())\
-        .first()
+    # (only indexed columns are selected so the lookup is served from the index)
+    latest = (await db.execute(
+        select(Payments.payment_status, Payments.payment_date)
+        .filter(Payments.userid == user_id)
+        .filter(Payments.stokvel_id == stokvel_id)
+        .order_by(Payments.payment_date.desc())
+        .limit(1)
+    )).first()
     
-    if not payment:
+    if not latest:
         return {"status": 0, "message": "No payments found"}
     
-    status = payment.compute_payment_status
+    status, last_payment_date = latest
     return {
         "status": status,
         "message": "Payment is up to date" if status == 1 else "Payment is due",
-        "last_payment_date": payment.date
+        "last_payment_date": last_payment_date
     }
-    
-    db_enrollment = StokvelEnrollment(**enrollment.model_dump())
-    db.add(db_enrollment)
-    db.commit()
-    db.refresh(db_enrollment)
-    return db_enrollment
-
-@app.get("/stokvels/{stokvel_id}/enrollments/", response_model=List[StokvelEnrollmentResponse])
-async def get_stokvel_enrollments(stokvel_id: int, db: Session = Depends(get_db)):
-    """Get all enrollments for a stokvel"""
-    enrollments = db.query(StokvelEnrollment).filter(StokvelEnrollment.stokvel_id == stokvel_id).all()
-    return enrollments
 
-# Payments endpoints
-@app.post("/payments/", response_model=PaymentsResponse)
-async def create_payment(payment: PaymentsCreate, db: Session = Depends(get_db)):
-    """Record a payment"""
-    # Verify user exists
-    user = db.query(User).filter(User.id == payment.userid).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    # Verify stokvel exists
-    stokvel = db.query(Stokvel).filter(Stokvel.id == payment.stokvel_id).first()
-    if not stokvel:
-        raise HTTPException(status_code=404, detail="Stokvel not found")
-    
-    db_payment = Payments(**payment.model_dump())
-    db.add(db_payment)
-    db.commit()
-    db.refresh(db_payment)
-    return db_payment
-
-@app.get("/stokvels/{stokvel_id}/payments/", response_model=List[PaymentsResponse])
-async def get_stokvel_payments(stokvel_id: int, db: Session = Depends(get_db)):
-    """Get all payments for a stokvel"""
-    payments = db.query(Payments).filter(Payments.stokvel_id == stokvel_id).all()
-    return payments
+@app.get("/stokvels/{stokvel_id}/payments/", response_model=Page[PaymentsResponse])
+async def get_stokvel_payments(
+    stokvel_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get all payments for a stokvel, newest first"""
+    query = select(Payments).filter(Payments.stokvel_id == stokvel_id)
+    return await paginate(db, query, PAYMENT_PAGE_KEY, cursor, limit, descending=True)
 
-@app.get("/users/{user_id}/payments/", response_model=List[PaymentsResponse])
-async def get_user_payments(user_id: int, db: Session = Depends(get_db)):
-    """Get all payments by a specific user"""
-    payments = db.query(Payments).filter(Payments.userid == user_id).all()
-    return payments
+@app.get("/users/{user_id}/payments/", response_model=Page[PaymentsResponse])
+async def get_user_payments(
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Depends(page_size),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get all payments by a specific user, newest first"""
+    query = select(Payments).filter(Payments.userid == user_id)
+    return await paginate(db, query, PAYMENT_PAGE_KEY, cursor, limit, descending=True)
 
 # Emergency withdrawal endpoint
 class EmergencyWithdrawRequest(BaseModel):
@@ -270,14 +242,14 @@ class EmergencyWithdrawRequest(BaseModel):
 @app.post("/emergency-withdrawal")
 async def emergency_withdrawal(
     withdrawal_request: EmergencyWithdrawRequest, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Process an emergency withdrawal for a user from a stokvel"""
-    user = db.query(User).filter(User.id == withdrawal_request.user_id).first()
+    user = await db.get(User, withdrawal_request.user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    result = user.emergency_withdraw(withdrawal_request.stokvel_id, db)
+    result = await user.emergency_withdraw(withdrawal_request.stokvel_id, db)
     
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["message"])
@@ -286,22 +258,25 @@ async def emergency_withdrawal(
 
 # Dashboard endpoint
 @app.get("/dashboard/{stokvel_id}")
-async def get_dashboard_data(stokvel_id: int, db: Session = Depends(get_db)):
+async def get_dashboard_data(stokvel_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get dashboard data for a stokvel"""
-    stokvel = db.query(Stokvel).filter(Stokvel.id == stokvel_id).first()
+    stokvel = await db.get(Stokvel, stokvel_id)
     if not stokvel:
         raise HTTPException(status_code=404, detail="Stokvel not found")
     
-    enrollments_count = db.query(StokvelEnrollment).filter(StokvelEnrollment.stokvel_id == stokvel_id).count()
-    total_payments = db.query(Payments).filter(Payments.stokvel_id == stokvel_id).count()
+    enrollments_count = await db.scalar(
+        select(func.count()).select_from(StokvelEnrollment).filter(StokvelEnrollment.stokvel_id == stokvel_id)
+    )
+    total_payments = await db.scalar(
+        select(func.count()).select_from(Payments).filter(Payments.stokvel_id == stokvel_id)
+    )
     
-    from sqlalchemy import func
-    total_amount = db.query(func.sum(Payments.amount)).filter(
-        Payments.stokvel_id == stokvel_id
-    ).scalar() or 0
+    total_amount = await db.scalar(
+        select(func.sum(Payments.amount)).filter(Payments.stokvel_id == stokvel_id)
+    ) or 0
     
     return {
-        "stokvel": stokvel,
+        "stokvel": StokvelResponse.model_validate(stokvel),
         "enrollments_count": enrollments_count,
         "total_payments": total_payments,
         "total_amount": float(total_amount)
@@ -315,7 +290,7 @@ class ChatResponse(BaseModel):
     response: str
 
 @app.post("/chat", response_model=ChatResponse)
-async def chat_with_ai(chat_message: ChatMessage, db: Session = Depends(get_db)):
+async def chat_with_ai(chat_message: ChatMessage, db: AsyncSession = Depends(get_async_db)):
     """Chat with the Stokvel AI agent"""
     try:
         response = await chat_with_stokvel_agent(chat_message.message, db)
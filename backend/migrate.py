@@ -0,0 +1,49 @@
+"""
+Database schema migrations
+
+Thin wrapper around Alembic so the API and operators share one entry point:
+
+    python migrate.py                 # upgrade to the latest revision
+    python migrate.py downgrade -1    # step back one revision
+    python migrate.py current         # show the applied revision
+"""
+
+import sys
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+
+ALEMBIC_INI = Path(__file__).with_name("alembic.ini")
+
+
+def alembic_config(database_url: str = None, connection=None) -> Config:
+    """Build the Alembic config, optionally bound to a URL or open connection"""
+    cfg = Config(str(ALEMBIC_INI))
+    if database_url:
+        cfg.set_main_option("sqlalchemy.url", database_url.replace("%", "%%"))
+    if connection is not None:
+        cfg.attributes["connection"] = connection
+    return cfg
+
+
+def upgrade(revision: str = "head", database_url: str = None, connection=None) -> None:
+    """Bring the database schema up to ``revision``"""
+    command.upgrade(alembic_config(database_url, connection), revision)
+
+
+def downgrade(revision: str, database_url: str = None) -> None:
+    """Roll the database schema back to ``revision``"""
+    command.downgrade(alembic_config(database_url), revision)
+
+
+if __name__ == "__main__":
+    action = sys.argv[1] if len(sys.argv) > 1 else "upgrade"
+    if action == "upgrade":
+        upgrade(sys.argv[2] if len(sys.argv) > 2 else "head")
+    elif action == "downgrade":
+        downgrade(sys.argv[2])
+    elif action == "current":
+        command.current(alembic_config(), verbose=True)
+    else:
+        sys.exit(f"Unknown action '{action}'. Use upgrade, downgrade or current.")
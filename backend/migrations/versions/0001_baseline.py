@@ -0,0 +1,100 @@
+"""Baseline schema
+
+Creates the tables that used to be built by ``Base.metadata.create_all`` at
+import time. Databases created that way already have them, so each table is
+only created when it is missing.
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _create_table(name, *columns):
+    if sa.inspect(op.get_bind()).has_table(name):
+        return
+    op.create_table(name, *columns)
+    op.create_index(f"ix_{name}_id", name, ["id"])
+
+
+def upgrade() -> None:
+    _create_table(
+        "stokvels",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("number_people", sa.Integer()),
+        sa.Column("goal", sa.Text()),
+        sa.Column("monthly_contribution", sa.Integer()),
+        sa.Column("net_value", sa.Integer(), nullable=False),
+        sa.Column("interest_rate", sa.Integer(), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("end_at", sa.DateTime(timezone=True)),
+    )
+    _create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("surname", sa.String(), nullable=False),
+        sa.Column("password", sa.String(), nullable=False),
+        sa.Column("email", sa.String()),
+        sa.Column("id_number", sa.String()),
+        sa.Column("joined_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("verified", sa.Boolean()),
+    )
+    _create_table(
+        "payments",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("userid", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("stokvel_id", sa.Integer(), sa.ForeignKey("stokvels.id"), nullable=False),
+        sa.Column("stokvel_name", sa.String(), nullable=False),
+        sa.Column("amount", sa.Numeric(12, 2), nullable=False),
+        sa.Column("payment_date", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("payment_status", sa.Integer(), nullable=False),
+    )
+    _create_table(
+        "stokvel_enrollment",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("userid", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("stokvel_id", sa.Integer(), sa.ForeignKey("stokvels.id"), nullable=False),
+        sa.Column("isAdmin", sa.Boolean(), nullable=False),
+        sa.Column("enrolled_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    _create_table(
+        "emergency_withdrawal_request",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("userid", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("stokvel_id", sa.Integer(), sa.ForeignKey("stokvels.id"), nullable=False),
+        sa.Column("reason", sa.Text(), nullable=False),
+        sa.Column("requested_amount", sa.Numeric(12, 2), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    _create_table(
+        "emergency_withdrawal_approval",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("request_id", sa.Integer(), sa.ForeignKey("emergency_withdrawal_request.id"), nullable=False),
+        sa.Column("userid", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("vote", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    for name in (
+        "emergency_withdrawal_approval",
+        "emergency_withdrawal_request",
+        "stokvel_enrollment",
+        "payments",
+        "users",
+        "stokvels",
+    ):
+        op.drop_table(name)
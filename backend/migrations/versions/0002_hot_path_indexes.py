@@ -0,0 +1,48 @@
+"""Composite indexes for the payment and enrollment hot paths
+
+Payments are filtered on (userid, stokvel_id) or stokvel_id and ordered by
+payment_date; enrollments are looked up by (userid, stokvel_id) and counted
+by stokvel_id. On Postgres the payment indexes INCLUDE amount so the SUM and
+COUNT queries are answered from the index alone.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-10-19
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_payments_user_stokvel_date", "payments",
+        ["userid", "stokvel_id", "payment_date"],
+        postgresql_include=["amount"],
+    )
+    op.create_index(
+        "ix_payments_stokvel_date", "payments",
+        ["stokvel_id", "payment_date"],
+        postgresql_include=["amount"],
+    )
+    op.create_index(
+        "ix_stokvel_enrollment_user_stokvel", "stokvel_enrollment",
+        ["userid", "stokvel_id"],
+    )
+    op.create_index(
+        "ix_stokvel_enrollment_stokvel_user", "stokvel_enrollment",
+        ["stokvel_id", "userid"],
+        postgresql_include=["isAdmin"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_stokvel_enrollment_stokvel_user", table_name="stokvel_enrollment")
+    op.drop_index("ix_stokvel_enrollment_user_stokvel", table_name="stokvel_enrollment")
+    op.drop_index("ix_payments_stokvel_date", table_name="payments")
+    op.drop_index("ix_payments_user_stokvel_date", table_name="payments")
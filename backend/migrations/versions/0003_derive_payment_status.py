@@ -0,0 +1,31 @@
+"""Derive payment status at query time
+
+payment_status is now a SQL expression on the Payments model (is the payment
+in the current month?), so the stored copy that GET requests used to
+rewrite is dropped.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("payments") as batch_op:
+        batch_op.drop_column("payment_status")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("payments") as batch_op:
+        batch_op.add_column(
+            sa.Column("payment_status", sa.Integer(), nullable=False, server_default="0")
+        )
@@ -0,0 +1,37 @@
+"""Indexes for keyset pagination over payments
+
+Payment lists are paged on (payment_date, id), so id is appended to the
+existing payment indexes and two more cover the per-user and unfiltered
+lists. Each page is then a single index range scan.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-10-19
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def _recreate_payment_index(name, columns):
+    op.drop_index(name, table_name="payments")
+    op.create_index(name, "payments", columns, postgresql_include=["amount"])
+
+
+def upgrade() -> None:
+    _recreate_payment_index("ix_payments_user_stokvel_date", ["userid", "stokvel_id", "payment_date", "id"])
+    _recreate_payment_index("ix_payments_stokvel_date", ["stokvel_id", "payment_date", "id"])
+    op.create_index("ix_payments_user_date", "payments", ["userid", "payment_date", "id"])
+    op.create_index("ix_payments_date", "payments", ["payment_date", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_payments_date", table_name="payments")
+    op.drop_index("ix_payments_user_date", table_name="payments")
+    _recreate_payment_index("ix_payments_stokvel_date", ["stokvel_id", "payment_date"])
+    _recreate_payment_index("ix_payments_user_stokvel_date", ["userid", "stokvel_id", "payment_date"])
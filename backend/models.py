@@ -1,13 +1,49 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean, Numeric
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean, Numeric, Index, and_, case
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import relationship, column_property
+from sqlalchemy.sql import func, functions, text
+from sqlalchemy.sql.expression import FunctionElement
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 from typing import Optional, List
 
 Base = declarative_base()
 
+# SQL expressions for the current month window, evaluated by the database
+class month_start(FunctionElement):
+    """Start of the current month"""
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+class next_month_start(FunctionElement):
+    """Start of the next month"""
+    type = DateTime(timezone=True)
+    inherit_cache = True
+
+@compiles(month_start)
+def _month_start(element, compiler, **kw):
+    return "date_trunc('month', now())"
+
+@compiles(next_month_start)
+def _next_month_start(element, compiler, **kw):
+    return "(date_trunc('month', now()) + interval '1 month')"
+
+@compiles(month_start, "sqlite")
+def _month_start_sqlite(element, compiler, **kw):
+    return "datetime('now', 'start of month')"
+
+@compiles(next_month_start, "sqlite")
+def _next_month_start_sqlite(element, compiler, **kw):
+    return "datetime('now', 'start of month', '+1 month')"
+
+# SQLite's CURRENT_TIMESTAMP has no fractional seconds, unlike the values
+# SQLAlchemy writes, which breaks ordering and keyset comparisons between the
+# two; render now() in SQLAlchemy's own storage format instead
+@compiles(functions.now, "sqlite")
+def _now_sqlite(element, compiler, **kw):
+    return "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+
 # SQLAlchemy Models
 class Stokvel(Base):
     __tablename__ = "stokvels"
@@ -42,18 +78,20 @@ class User(Base):
     enrollments = relationship("StokvelEnrollment", back_populates="user")
     payments = relationship("Payments", back_populates="user")
     
-    def emergency_withdraw(self, stokvel_id: int, db_session) -> dict:
+    async def emergency_withdraw(self, stokvel_id: int, db_session) -> dict:
         """
         Emergency withdrawal method for a user from a specific stokvel.
         Calculates the user's total contributions and allows withdrawal with potential penalties.
         """
-        from sqlalchemy import func
+        from sqlalchemy import func, select
         
         # Check if user is enrolled in the stokvel
-        enrollment = db_session.query(StokvelEnrollment).filter(
-            StokvelEnrollment.userid == self.id,
-            StokvelEnrollment.stokvel_id == stokvel_id
-        ).first()
+        enrollment = await db_session.scalar(
+            select(StokvelEnrollment).filter(
+                StokvelEnrollment.userid == self.id,
+                StokvelEnrollment.stokvel_id == stokvel_id
+            ).limit(1)
+        )
         
         if not enrollment:
             return {
@@ -63,7 +101,7 @@ class User(Base):
             }
         
         # Get the stokvel details
-        stokvel = db_session.query(Stokvel).filter(Stokvel.id == stokvel_id).first()
+        stokvel = await db_session.get(Stokvel, stokvel_id)
         if not stokvel:
             return {
                 "success": False,
@@ -72,10 +110,12 @@ class User(Base):
             }
         
         # Calculate total contributions by this user to this stokvel
-        total_contributions = db_session.query(func.sum(Payments.amount)).filter(
-            Payments.userid == self.id,
-            Payments.stokvel_id == stokvel_id
-        ).scalar() or 0
+        total_contributions = await db_session.scalar(
+            select(func.sum(Payments.amount)).filter(
+                Payments.userid == self.id,
+                Payments.stokvel_id == stokvel_id
+            )
+        ) or 0
         
         if total_contributions <= 0:
             return {
@@ -102,7 +142,7 @@ class User(Base):
         stokvel.net_value -= int(withdrawal_amount)
         
         # Remove user from stokvel enrollment
-        db_session.delete(enrollment)
+        await db_session.delete(enrollment)
         
         # Record the withdrawal as a negative payment
         withdrawal_record = Payments(
@@ -114,7 +154,7 @@ class User(Base):
         db_session.add(withdrawal_record)
         
         try:
-            db_session.commit()
+            await db_session.commit()
             return {
                 "success": True,
                 "message": "Emergency withdrawal successful",
@@ -124,7 +164,7 @@ class User(Base):
                 "remaining_stokvel_value": stokvel.net_value
             }
         except Exception as e:
-            db_session.rollback()
+            await db_session.rollback()
             return {
                 "success": False,
                 "message": f"Database error during withdrawal: {str(e)}",
@@ -133,6 +173,17 @@ class User(Base):
 
 class Payments(Base):
     __tablename__ = "payments"
+    __table_args__ = (
+        # Member ledger lookups: status, withdrawal totals, agent history
+        Index("ix_payments_user_stokvel_date", "userid", "stokvel_id", "payment_date", "id",
+              postgresql_include=["amount"]),
+        # Stokvel ledger lookups: dashboard totals, stokvel payment lists
+        Index("ix_payments_stokvel_date", "stokvel_id", "payment_date", "id",
+              postgresql_include=["amount"]),
+        # Keyset pages over a user's payments and over all payments
+        Index("ix_payments_user_date", "userid", "payment_date", "id"),
+        Index("ix_payments_date", "payment_date", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     userid = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -140,25 +191,15 @@ class Payments(Base):
     stokvel_name = Column(String, nullable=False)
     amount = Column(Numeric(12, 2), nullable=False)
     payment_date = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    payment_status = Column(Integer, default=0, nullable=False)
     
-    @property
-    def compute_payment_status(self):
-        # Get the first and last day of the current month with UTC timezone
-        if not self.payment_date:
-            return 0
-            
-        today = datetime.now(self.payment_date.tzinfo)  
-        start_of_month = datetime(today.year, today.month, 1, tzinfo=self.payment_date.tzinfo)
-        if today.month == 12:
-            end_of_month = datetime(today.year + 1, 1, 1, tzinfo=self.payment_date.tzinfo)
-        else:
-            end_of_month = datetime(today.year, today.month + 1, 1, tzinfo=self.payment_date.tzinfo)
-        
-        # Check if payment date is within the current month
-        if start_of_month <= self.payment_date < end_of_month:
-            return 1
-        return 0
+    # 1 if the payment falls in the current calendar month, else 0. Computed
+    # by the database on every load so reads never have to write it back.
+    payment_status = column_property(
+        case(
+            (and_(payment_date >= month_start(), payment_date < next_month_start()), 1),
+            else_=0
+        )
+    )
     
     # Relationships
     user = relationship("User", back_populates="payments")
@@ -166,6 +207,11 @@ class Payments(Base):
 
 class StokvelEnrollment(Base):
     __tablename__ = "stokvel_enrollment"
+    __table_args__ = (
+        Index("ix_stokvel_enrollment_user_stokvel", "userid", "stokvel_id"),
+        Index("ix_stokvel_enrollment_stokvel_user", "stokvel_id", "userid",
+              postgresql_include=["isAdmin"]),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     userid = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -264,7 +310,6 @@ class PaymentsBase(BaseModel):
     stokvel_id: int
     stokvel_name: str
     amount: float
-    payment_status: Optional[int] = 0
 
 class PaymentsCreate(PaymentsBase):
     pass
@@ -274,6 +319,7 @@ class PaymentsResponse(PaymentsBase):
     
     id: int
     payment_date: datetime
+    payment_status: int = 0
 
 # Emergency Withdrawal Models
 class EmergencyWithdrawalRequestBase(BaseModel):
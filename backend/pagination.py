@@ -0,0 +1,94 @@
+"""
+Keyset (cursor) pagination for the collection endpoints
+
+Pages are ordered on a unique key (e.g. ``(payment_date, id)`` or ``id``) and
+each page carries an opaque ``next_cursor`` holding the key of its last row.
+The next page is fetched with ``WHERE key > cursor`` instead of an OFFSET, so
+page N costs the same index seek as page 1.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Generic, List, Optional, TypeVar
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """One page of a collection; pass next_cursor back as ?cursor= for the next page"""
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+def page_size(limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)) -> int:
+    """Dependency for the page size query parameter"""
+    return limit
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(values) -> str:
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError(cursor)
+        return [_decode_value(v) for v in values]
+    except (ValueError, binascii.Error, json.JSONDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+async def paginate(
+    db: AsyncSession,
+    query,
+    key_columns,
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = False,
+) -> Page:
+    """
+    Run ``query`` for one page ordered by ``key_columns``
+
+    ``key_columns`` must identify rows uniquely (end with the primary key) and
+    should match an index so the cursor predicate is an index seek.
+    """
+    if cursor:
+        values = decode_cursor(cursor, len(key_columns))
+        key, after = tuple_(*key_columns), tuple_(*values)
+        query = query.where(key < after if descending else key > after)
+
+    order = [column.desc() if descending else column.asc() for column in key_columns]
+    rows = (await db.scalars(query.order_by(*order).limit(limit + 1))).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in key_columns])
+
+    return Page(items=rows, next_cursor=next_cursor)
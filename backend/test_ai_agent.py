@@ -6,8 +6,7 @@ This script tests the AI agent functionality without requiring the full web appl
 
 import asyncio
 import os
-from sqlalchemy.orm import sessionmaker
-from config import engine
+from config import AsyncSessionLocal
 from ai_agent import chat_with_stokvel_agent
 
 
@@ -15,8 +14,7 @@ async def test_chat_agent():
     """Test the chat agent with some sample questions"""
     
     # Create database session
-    SessionLocal = sessionmaker(bind=engine)
-    db = SessionLocal()
+    db = AsyncSessionLocal()
     
     try:
         # Test questions
@@ -49,7 +47,7 @@ async def test_chat_agent():
         print(f"❌ Test failed: {e}")
     
     finally:
-        db.close()
+        await db.close()
 
 
 if __name__ == "__main__":
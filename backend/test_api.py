@@ -0,0 +1,166 @@
+"""
+API tests for the Stokvel backend
+
+These run the FastAPI app in-process against the async SQLite test database.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+
+from config import async_engine
+from models import Payments
+
+pytestmark = pytest.mark.anyio
+
+
+async def create_stokvel(client, **overrides):
+    data = {
+        "name": "Community Savings Circle",
+        "number_people": 3,
+        "goal": "Save for community projects",
+        "monthly_contribution": 1000,
+        "net_value": 25000,
+        "interest_rate": 5,
+    }
+    data.update(overrides)
+    response = await client.post("/stokvels/", json=data)
+    assert response.status_code == 200
+    return response.json()
+
+
+async def create_user(client, **overrides):
+    data = {
+        "name": "Alice",
+        "surname": "Johnson",
+        "password": "password123",
+        "email": "alice.johnson@email.com",
+    }
+    data.update(overrides)
+    response = await client.post("/users/", json=data)
+    assert response.status_code == 200
+    return response.json()
+
+
+async def create_payment(client, user, stokvel, amount=1000):
+    response = await client.post("/payments/", json={
+        "userid": user["id"],
+        "stokvel_id": stokvel["id"],
+        "stokvel_name": stokvel["name"],
+        "amount": amount,
+    })
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_stokvel_and_user_crud(client):
+    stokvel = await create_stokvel(client)
+    user = await create_user(client)
+
+    response = await client.get(f"/stokvels/{stokvel['id']}")
+    assert response.json()["name"] == "Community Savings Circle"
+
+    response = await client.get(f"/users/{user['id']}")
+    assert response.json()["surname"] == "Johnson"
+
+    assert (await client.get("/stokvels/999")).status_code == 404
+    assert (await client.get("/users/999")).status_code == 404
+
+
+async def test_enrollment_requires_existing_user_and_stokvel(client):
+    stokvel = await create_stokvel(client)
+    user = await create_user(client)
+
+    response = await client.post("/enrollments/", json={"userid": 999, "stokvel_id": stokvel["id"]})
+    assert response.status_code == 404
+
+    response = await client.post("/enrollments/", json={"userid": user["id"], "stokvel_id": stokvel["id"]})
+    assert response.status_code == 200
+
+    response = await client.get(f"/stokvels/{stokvel['id']}/enrollments/")
+    assert [e["userid"] for e in response.json()["items"]] == [user["id"]]
+
+
+async def test_payments_and_dashboard(client):
+    stokvel = await create_stokvel(client)
+    user = await create_user(client)
+    await client.post("/enrollments/", json={"userid": user["id"], "stokvel_id": stokvel["id"]})
+
+    payment = await create_payment(client, user, stokvel, amount=500)
+    await create_payment(client, user, stokvel, amount=750)
+    assert payment["payment_status"] == 1
+
+    response = await client.get("/payments/", params={"stokvel_id": stokvel["id"]})
+    assert len(response.json()["items"]) == 2
+
+    response = await client.get(f"/payments/{payment['id']}")
+    assert response.json()["amount"] == 500
+
+    response = await client.get(
+        f"/payments/user/{user['id']}/status", params={"stokvel_id": stokvel["id"]}
+    )
+    assert response.json()["status"] == 1
+
+    response = await client.get(f"/dashboard/{stokvel['id']}")
+    dashboard = response.json()
+    assert dashboard["stokvel"]["id"] == stokvel["id"]
+    assert dashboard["enrollments_count"] == 1
+    assert dashboard["total_payments"] == 2
+    assert dashboard["total_amount"] == 1250
+
+
+async def test_payment_status_is_derived_without_writes(client, db):
+    stokvel = await create_stokvel(client)
+    user = await create_user(client)
+    db.add(Payments(
+        userid=user["id"], stokvel_id=stokvel["id"], stokvel_name=stokvel["name"],
+        amount=1000, payment_date=datetime.now(timezone.utc) - timedelta(days=62),
+    ))
+    await db.commit()
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        response = await client.get("/payments/", params={"user_id": user["id"]})
+        status = await client.get(
+            f"/payments/user/{user['id']}/status", params={"stokvel_id": stokvel["id"]}
+        )
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+
+    assert [p["payment_status"] for p in response.json()["items"]] == [0]
+    assert status.json()["status"] == 0
+    assert all(s.lstrip().upper().startswith("SELECT") for s in statements)
+
+
+async def collect_pages(client, url, limit):
+    items, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        page = (await client.get(url, params=params)).json()
+        items.extend(page["items"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if not cursor:
+            return items, pages
+
+
+async def test_collections_use_cursor_pagination(client):
+    stokvels = [await create_stokvel(client, name=f"Stokvel {i}") for i in range(5)]
+    user = await create_user(client)
+
+    items, pages = await collect_pages(client, "/stokvels/", limit=2)
+    assert [s["id"] for s in items] == [s["id"] for s in stokvels]
+    assert pages == 3
+
+    for stokvel in stokvels:
+        await create_payment(client, user, stokvel)
+    items, pages = await collect_pages(client, f"/users/{user['id']}/payments/", limit=2)
+    ids = [p["id"] for p in items]
+    assert len(ids) == 5 and len(set(ids)) == 5
+    assert [p["payment_date"] for p in items] == sorted((p["payment_date"] for p in items), reverse=True)
+
+    assert (await client.get("/payments/", params={"cursor": "not-a-cursor"})).status_code == 400
+    assert (await client.get("/payments/", params={"limit": 100000})).status_code == 422
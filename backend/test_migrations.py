@@ -0,0 +1,50 @@
+"""
+Schema migration tests
+
+Runs the Alembic migrations against fresh SQLite databases and checks the
+result matches the SQLAlchemy models.
+"""
+
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+
+import migrate
+from models import Base
+
+
+def upgraded_engine(tmp_path, name="migrated.db"):
+    engine = create_engine(f"sqlite:///{tmp_path / name}")
+    with engine.begin() as conn:
+        migrate.upgrade(connection=conn)
+    return engine
+
+
+def test_migrations_match_models(tmp_path):
+    engine = upgraded_engine(tmp_path)
+    with engine.connect() as conn:
+        diff = compare_metadata(MigrationContext.configure(conn), Base.metadata)
+    assert diff == []
+
+
+def test_hot_path_indexes_exist(tmp_path):
+    inspector = inspect(upgraded_engine(tmp_path))
+    payment_indexes = {ix["name"]: ix["column_names"] for ix in inspector.get_indexes("payments")}
+    assert payment_indexes["ix_payments_user_stokvel_date"] == ["userid", "stokvel_id", "payment_date", "id"]
+    assert payment_indexes["ix_payments_stokvel_date"] == ["stokvel_id", "payment_date", "id"]
+
+    enrollment_indexes = {ix["name"] for ix in inspector.get_indexes("stokvel_enrollment")}
+    assert "ix_stokvel_enrollment_user_stokvel" in enrollment_indexes
+
+
+def test_upgrade_adopts_database_built_by_create_all(tmp_path):
+    # A pre-migration database has the baseline tables but no version table
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        migrate.upgrade("0001", connection=conn)
+        conn.execute(text("DROP TABLE alembic_version"))
+
+    with engine.begin() as conn:
+        migrate.upgrade(connection=conn)
+
+    assert "ix_payments_stokvel_date" in {ix["name"] for ix in inspect(engine).get_indexes("payments")}